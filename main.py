@@ -3,21 +3,32 @@
 
 import json
 import math
+import os
 import random
 import sys
-from dataclasses import dataclass, field
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set
 
 import pygame
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder.
+    orjson = None
+
 
 # ----------------------------------------------------------------------------
 # Data definitions for moves and monsters
 # ----------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Move:
     name: str
     power: int
@@ -25,7 +36,7 @@ class Move:
     type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Monster:
     name: str
     level: int
@@ -35,11 +46,20 @@ class Monster:
     defense: int
     speed: int
     type: str
-    moves: List[Move] = field(default_factory=list)
+    # Moves are immutable, so clones share their template's tuple.
+    moves: tuple[Move, ...] = ()
     exp: int = 0
     exp_to_next: int = 20
-    front_sprite: Optional[pygame.Surface] = field(default=None, repr=False)
-    back_sprite: Optional[pygame.Surface] = field(default=None, repr=False)
+    front_sprite_file: Optional[str] = field(default=None, repr=False)
+    back_sprite_file: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def front_sprite(self) -> Optional[pygame.Surface]:
+        return load_sprite_image(self.front_sprite_file)
+
+    @property
+    def back_sprite(self) -> Optional[pygame.Surface]:
+        return load_sprite_image(self.back_sprite_file)
 
     def is_fainted(self) -> bool:
         return self.current_hp <= 0
@@ -77,6 +97,26 @@ TRAINER_DATA_FILE = ASSETS_DIR / "trainers.json"
 SAVE_FILE = Path(__file__).parent / "savegame.json"
 
 MAX_PARTY_SIZE = 6
+SPRITE_SIZE = 96
+
+# One worker so saves reach the disk in the order they were made.
+_SAVE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+# Every save that has been submitted but not yet reported back to the game.
+_pending_saves: List[Future] = []
+SAVE_FINISHED = pygame.event.custom_type()
+
+
+def _json_dumps(data: object, default: Optional[Callable[[object], object]] = None) -> bytes:
+    if orjson is not None:
+        # Dataclasses go through ``default`` too, so callers pick their format.
+        return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(data, indent=2, default=default).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def create_move_library() -> Dict[str, Move]:
@@ -93,7 +133,11 @@ def create_move_library() -> Dict[str, Move]:
     }
 
 
-def load_sprite_image(filename: Optional[str]) -> Optional[pygame.Surface]:
+# Memoized per filename so every new wild monster or clone reuses the decoded
+# Surface. Missing or unreadable files are remembered as None; a failure to
+# convert (no display mode set yet) raises instead, so it is retried later.
+@lru_cache(maxsize=256)
+def _load_sprite_file(filename: Optional[str]) -> Optional[pygame.Surface]:
     if not filename:
         return None
     sprite_path = Path(filename)
@@ -102,10 +146,33 @@ def load_sprite_image(filename: Optional[str]) -> Optional[pygame.Surface]:
     if not sprite_path.exists():
         return None
     try:
-        image = pygame.image.load(str(sprite_path)).convert_alpha()
+        image = pygame.image.load(str(sprite_path))
+    except pygame.error:
+        return None
+    image = image.convert_alpha()
+    if image.get_size() == (SPRITE_SIZE, SPRITE_SIZE):
+        return image
+    return pygame.transform.smoothscale(image, (SPRITE_SIZE, SPRITE_SIZE)).convert_alpha()
+
+
+def load_sprite_image(filename: Optional[str]) -> Optional[pygame.Surface]:
+    try:
+        return _load_sprite_file(filename)
     except pygame.error:
         return None
-    return pygame.transform.smoothscale(image, (96, 96))
+
+
+# Stat defaults for monsters.json entries that omit a field.
+_MONSTER_DEFAULTS: Dict[str, object] = {
+    "level": 1,
+    "max_hp": 20,
+    "attack": 10,
+    "defense": 10,
+    "speed": 10,
+    "type": "normal",
+    "exp": 0,
+    "exp_to_next": 20,
+}
 
 
 def create_monster_templates(move_library: Dict[str, Move]) -> Dict[str, Monster]:
@@ -116,12 +183,12 @@ def create_monster_templates(move_library: Dict[str, Move]) -> Dict[str, Monster
             "Missing monsters.json. Add your monster roster to assets/monsters.json."
         )
 
-    with MONSTER_DATA_FILE.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = _json_loads(MONSTER_DATA_FILE.read_bytes())
 
     templates: Dict[str, Monster] = {}
     for entry in data.get("monsters", []):
-        name = entry["name"]
+        # Names key the template table and every party/save lookup.
+        name = sys.intern(entry["name"])
         move_names = entry.get("moves", [])
         moves: List[Move] = []
         for move_name in move_names:
@@ -130,20 +197,14 @@ def create_monster_templates(move_library: Dict[str, Move]) -> Dict[str, Monster
             moves.append(move_library[move_name])
 
         sprites = entry.get("sprites", {})
+        stats = {**_MONSTER_DEFAULTS, **{k: v for k, v in entry.items() if k in _MONSTER_DEFAULTS}}
+        stats["current_hp"] = entry.get("current_hp", stats["max_hp"])
         templates[name] = Monster(
             name=name,
-            level=entry.get("level", 1),
-            max_hp=entry.get("max_hp", 20),
-            current_hp=entry.get("current_hp", entry.get("max_hp", 20)),
-            attack=entry.get("attack", 10),
-            defense=entry.get("defense", 10),
-            speed=entry.get("speed", 10),
-            type=entry.get("type", "normal"),
-            moves=moves,
-            exp=entry.get("exp", 0),
-            exp_to_next=entry.get("exp_to_next", 20),
-            front_sprite=load_sprite_image(sprites.get("front")),
-            back_sprite=load_sprite_image(sprites.get("back")),
+            moves=tuple(moves),
+            **stats,
+            front_sprite_file=sprites.get("front"),
+            back_sprite_file=sprites.get("back"),
         )
 
     return templates
@@ -164,8 +225,8 @@ def load_trainers() -> Dict[str, Dict[str, object]]:
         return {}
 
     try:
-        trainer_data = json.loads(TRAINER_DATA_FILE.read_text())
-    except json.JSONDecodeError:
+        trainer_data = _json_loads(TRAINER_DATA_FILE.read_bytes())
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return {}
 
     trainers: Dict[str, Dict[str, object]] = {}
@@ -188,21 +249,7 @@ def load_trainers() -> Dict[str, Dict[str, object]]:
 
 def clone_monster(template: Monster) -> Monster:
     """Create a copy of a monster template so encounters do not share state."""
-    return Monster(
-        name=template.name,
-        level=template.level,
-        max_hp=template.max_hp,
-        current_hp=template.current_hp,
-        attack=template.attack,
-        defense=template.defense,
-        speed=template.speed,
-        type=template.type,
-        moves=list(template.moves),
-        exp=template.exp,
-        exp_to_next=template.exp_to_next,
-        front_sprite=template.front_sprite,
-        back_sprite=template.back_sprite,
-    )
+    return replace(template)
 
 
 def monster_to_dict(monster: Monster) -> Dict[str, int | str]:
@@ -219,19 +266,23 @@ def monster_to_dict(monster: Monster) -> Dict[str, int | str]:
     }
 
 
+def _monster_to_json(obj: object) -> Dict[str, int | str]:
+    if isinstance(obj, Monster):
+        return monster_to_dict(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+_SAVED_STAT_FIELDS = ("level", "max_hp", "attack", "defense", "speed", "exp", "exp_to_next")
+
+
 def monster_from_dict(data: Dict[str, object], templates: Dict[str, Monster]) -> Optional[Monster]:
     name = data.get("name")
     if not name or name not in templates:
         return None
-    base = clone_monster(templates[name])
-    base.level = data.get("level", base.level)
-    base.max_hp = data.get("max_hp", base.max_hp)
+    template = templates[name]
+    overrides = {key: data[key] for key in _SAVED_STAT_FIELDS if key in data}
+    base = replace(template, **overrides)
     base.current_hp = min(data.get("current_hp", base.max_hp), base.max_hp)
-    base.attack = data.get("attack", base.attack)
-    base.defense = data.get("defense", base.defense)
-    base.speed = data.get("speed", base.speed)
-    base.exp = data.get("exp", base.exp)
-    base.exp_to_next = data.get("exp_to_next", base.exp_to_next)
     return base
 
 
@@ -244,21 +295,69 @@ def save_game_state(
     player: "Player",
     party: List[Monster],
     storage: List[Monster],
-    badges: Optional[List[str]] = None,
-    defeated_trainers: Optional[List[str]] = None,
-) -> None:
-    """Persist the player's position, party, storage, and trainer progress."""
+    badges: Optional[Iterable[str]] = None,
+    defeated_trainers: Optional[Iterable[str]] = None,
+) -> Future:
+    """Persist the player's position, party, storage, and trainer progress.
+
+    The file is written in the background. A SAVE_FINISHED event carrying
+    the returned future is posted once the write has succeeded or failed.
+    """
 
-    badges = badges or []
-    defeated_trainers = defeated_trainers or []
     data = {
         "player": {"x": player.tile_x, "y": player.tile_y},
-        "party": [monster_to_dict(monster) for monster in party[:MAX_PARTY_SIZE]],
-        "storage": [monster_to_dict(monster) for monster in storage],
-        "badges": list(badges),
-        "defeated_trainers": list(defeated_trainers),
+        "party": party[:MAX_PARTY_SIZE],
+        "storage": storage,
+        "badges": sorted(badges or ()),
+        "defeated_trainers": sorted(defeated_trainers or ()),
     }
-    path.write_text(json.dumps(data, indent=2))
+    # Monsters are converted by the encoder as it reaches them. Encoding stays
+    # on the calling thread so the snapshot can't change underneath it; only
+    # the disk write is handed off.
+    payload = _json_dumps(data, default=_monster_to_json)
+    future = _SAVE_POOL.submit(_write_save, path, payload)
+    _pending_saves.append(future)
+    future.add_done_callback(_post_save_finished)
+    return future
+
+
+def _write_save(path: Path, payload: bytes) -> None:
+    # Write beside the real file and swap it in, so a crash mid-write never
+    # leaves a truncated save behind. The fsync makes sure the bytes are on
+    # disk before the rename can point at them.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _post_save_finished(future: Future) -> None:
+    # Runs on the save thread; posting wakes the main loop if it is idle.
+    try:
+        pygame.event.post(pygame.event.Event(SAVE_FINISHED, future=future))
+    except pygame.error:
+        pass  # pygame has already shut down
+
+
+def finish_save(future: Future) -> str:
+    """Drop a finished save from the pending list and describe how it went."""
+    if future in _pending_saves:
+        _pending_saves.remove(future)
+    error = future.exception()
+    if error is not None:
+        return f"Save failed: {error}"
+    return "Game saved!"
+
+
+def wait_for_pending_save() -> List[BaseException]:
+    """Block until every outstanding save has finished and return any write errors."""
+    # exception() blocks until each write is done. A SAVE_FINISHED post that
+    # races with pygame.quit() afterwards is dropped by _post_save_finished.
+    pending = list(_pending_saves)
+    _pending_saves.clear()
+    return [error for error in (future.exception() for future in pending) if error is not None]
 
 
 def load_game_state(
@@ -266,14 +365,14 @@ def load_game_state(
     templates: Dict[str, Monster],
     default_party: List[Monster],
     default_position: tuple[int, int],
-) -> tuple[tuple[int, int], List[Monster], List[Monster], List[str], List[str]]:
+) -> tuple[tuple[int, int], List[Monster], List[Monster], Set[str], Set[str]]:
     if not path.exists():
-        return default_position, list(default_party), [], [], []
+        return default_position, list(default_party), [], set(), set()
 
     try:
-        data = json.loads(path.read_text())
-    except json.JSONDecodeError:
-        return default_position, list(default_party), [], [], []
+        data = _json_loads(path.read_bytes())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return default_position, list(default_party), [], set(), set()
 
     player_data = data.get("player", {})
     player_x = int(player_data.get("x", default_position[0]))
@@ -295,8 +394,8 @@ def load_game_state(
         if monster:
             loaded_storage.append(monster)
 
-    badges = data.get("badges", []) or []
-    defeated_trainers = data.get("defeated_trainers", []) or []
+    badges = set(data.get("badges", []) or [])
+    defeated_trainers = set(data.get("defeated_trainers", []) or [])
 
     return player_position, loaded_party, loaded_storage, badges, defeated_trainers
 
@@ -341,7 +440,11 @@ MAP_WIDTH = len(MAP_LAYOUT[0])
 MAP_HEIGHT = len(MAP_LAYOUT)
 MAP_PIXEL_WIDTH = MAP_WIDTH * TILE_SIZE
 MAP_PIXEL_HEIGHT = MAP_HEIGHT * TILE_SIZE
+# Furthest the camera can scroll before it would show past the map edge.
+MAX_CAMERA_X = max(0, MAP_PIXEL_WIDTH - WINDOW_WIDTH)
+MAX_CAMERA_Y = max(0, MAP_PIXEL_HEIGHT - WINDOW_HEIGHT)
 DEFAULT_START_POSITION = (2, 2)
+OVERWORLD_BACKGROUND = (76, 120, 160)
 TRAINER_TILES = {"T": "forest_bug_catcher_1", "L": "grove_gym_leader"}
 
 TILE_TYPES = {
@@ -424,6 +527,20 @@ TILE_TYPES = {
     },
 }
 
+_WALKABLE = frozenset(tile for tile, info in TILE_TYPES.items() if info["walkable"])
+
+# Flattened copy of MAP_LAYOUT (row-major, one byte per tile) so a tile
+# lookup is a single indexed load.
+_MAP_FLAT = "".join(MAP_LAYOUT).encode("ascii")
+
+# Trainer id for every trainer tile on the map, keyed by (x, y).
+_TRAINER_POSITIONS: Dict[tuple[int, int], str] = {
+    (x, y): TRAINER_TILES[tile]
+    for y, row in enumerate(MAP_LAYOUT)
+    for x, tile in enumerate(row)
+    if tile in TRAINER_TILES
+}
+
 
 def create_patterned_tile_surface(
     tile_key: str, tile_info: Dict[str, object], tile_size: int
@@ -436,12 +553,24 @@ def create_patterned_tile_surface(
 
     pattern = tile_info.get("pattern", "solid")
     rng = random.Random(f"{tile_key}-{tile_size}")
+    rr = rng.randrange
+    ri = rng.randint
+    dline = pygame.draw.line
+    dcircle = pygame.draw.circle
+    drect = pygame.draw.rect
+    set_at = surface.set_at
 
     def scatter_pixels(colors: List[tuple[int, int, int]], count: int) -> None:
-        for _ in range(count):
-            x = rng.randrange(tile_size)
-            y = rng.randrange(tile_size)
-            surface.set_at((x, y), colors[rng.randrange(len(colors))])
+        # Hold the lock for the whole batch; set_at would otherwise lock and
+        # unlock the surface once per pixel.
+        surface.lock()
+        try:
+            for _ in range(count):
+                x = rr(tile_size)
+                y = rr(tile_size)
+                set_at((x, y), colors[rr(len(colors))])
+        finally:
+            surface.unlock()
 
     if pattern == "grass":
         accent_colors = tile_info.get("accent_colors", []) or [
@@ -450,13 +579,13 @@ def create_patterned_tile_surface(
         ]
         scatter_pixels(accent_colors, tile_size * 3)
         for _ in range(tile_size // 2):
-            start_x = rng.randrange(tile_size)
-            start_y = rng.randrange(tile_size // 2, tile_size)
-            end_x = start_x + rng.randint(-2, 2)
-            end_y = start_y - rng.randint(3, 6)
-            pygame.draw.line(
+            start_x = rr(tile_size)
+            start_y = rr(tile_size // 2, tile_size)
+            end_x = start_x + ri(-2, 2)
+            end_y = start_y - ri(3, 6)
+            dline(
                 surface,
-                accent_colors[rng.randrange(len(accent_colors))],
+                accent_colors[rr(len(accent_colors))],
                 (start_x, start_y),
                 (end_x, max(0, end_y)),
                 1,
@@ -465,11 +594,11 @@ def create_patterned_tile_surface(
         accent = tile_info.get("accent_color", (140, 120, 80))
         scatter_pixels([accent, (220, 204, 160)], tile_size * 2)
         for _ in range(tile_size // 2):
-            radius = rng.randint(1, 2)
-            pygame.draw.circle(
+            radius = ri(1, 2)
+            dcircle(
                 surface,
                 (160, 150, 120),
-                (rng.randrange(tile_size), rng.randrange(tile_size)),
+                (rr(tile_size), rr(tile_size)),
                 radius,
             )
     elif pattern == "stone":
@@ -478,30 +607,30 @@ def create_patterned_tile_surface(
         brick_w = max(6, tile_size // 3)
         for y in range(0, tile_size, brick_h):
             offset = (y // brick_h % 2) * (brick_w // 2)
-            pygame.draw.line(surface, mortar, (0, y), (tile_size, y), 1)
+            dline(surface, mortar, (0, y), (tile_size, y), 1)
             for x in range(-offset, tile_size, brick_w):
                 rect = pygame.Rect(x, y, brick_w, brick_h)
-                pygame.draw.rect(surface, mortar, rect, 1)
+                drect(surface, mortar, rect, 1)
     elif pattern == "floor":
         accent = tile_info.get("accent_color", (148, 146, 170))
         block = max(4, tile_size // 4)
         for y in range(0, tile_size, block):
             for x in range(0, tile_size, block):
                 if (x // block + y // block) % 2 == 0:
-                    pygame.draw.rect(
+                    drect(
                         surface,
                         accent,
                         pygame.Rect(x, y, block, block),
                     )
     elif pattern == "door":
         accent = tile_info.get("accent_color", (116, 88, 52))
-        pygame.draw.rect(
+        drect(
             surface,
             accent,
             pygame.Rect(tile_size // 4, tile_size // 6, tile_size // 2, tile_size - tile_size // 3),
             0,
         )
-        pygame.draw.circle(
+        dcircle(
             surface,
             (240, 220, 180),
             (tile_size // 2 + tile_size // 5, tile_size // 2),
@@ -509,23 +638,23 @@ def create_patterned_tile_surface(
         )
     elif pattern == "house_wall":
         beam = tile_info.get("accent_color", (120, 94, 68))
-        pygame.draw.rect(surface, beam, pygame.Rect(0, 0, tile_size, max(2, tile_size // 16)))
-        pygame.draw.rect(
+        drect(surface, beam, pygame.Rect(0, 0, tile_size, max(2, tile_size // 16)))
+        drect(
             surface, beam, pygame.Rect(0, tile_size - max(2, tile_size // 16), tile_size, tile_size // 16)
         )
-        pygame.draw.rect(surface, beam, pygame.Rect(tile_size // 3, 0, tile_size // 8, tile_size))
-        pygame.draw.rect(
+        drect(surface, beam, pygame.Rect(tile_size // 3, 0, tile_size // 8, tile_size))
+        drect(
             surface, beam, pygame.Rect(tile_size - tile_size // 3, 0, tile_size // 8, tile_size)
         )
     elif pattern == "healing":
         accent = tile_info.get("accent_color", (90, 170, 160))
         cross_w = max(4, tile_size // 5)
-        pygame.draw.rect(
+        drect(
             surface,
             accent,
             pygame.Rect(tile_size // 2 - cross_w // 2, tile_size // 4, cross_w, tile_size // 2),
         )
-        pygame.draw.rect(
+        drect(
             surface,
             accent,
             pygame.Rect(tile_size // 4, tile_size // 2 - cross_w // 2, tile_size // 2, cross_w),
@@ -539,15 +668,15 @@ def create_patterned_tile_surface(
                 int(base_color[1] * (1 - blend) + accent[1] * blend),
                 int(base_color[2] * (1 - blend) + accent[2] * blend),
             )
-            pygame.draw.line(surface, color, (0, y), (tile_size, y))
+            surface.fill(color, (0, y, tile_size, 1))
         wave_color = (230, 245, 255)
         for _ in range(tile_size // 2):
-            start_x = rng.randrange(tile_size)
-            length = rng.randint(tile_size // 2, tile_size)
+            start_x = rr(tile_size)
+            length = ri(tile_size // 2, tile_size)
             pygame.draw.arc(
                 surface,
                 wave_color,
-                pygame.Rect(start_x - length // 2, rng.randrange(tile_size), length, tile_size // 2),
+                pygame.Rect(start_x - length // 2, rr(tile_size), length, tile_size // 2),
                 0,
                 math.pi,
                 1,
@@ -556,20 +685,24 @@ def create_patterned_tile_surface(
         accent = tile_info.get("accent_color", (110, 84, 60))
         plank_h = max(4, tile_size // 5)
         for y in range(0, tile_size, plank_h):
-            pygame.draw.rect(surface, accent, pygame.Rect(0, y, tile_size, plank_h), 1)
+            drect(surface, accent, pygame.Rect(0, y, tile_size, plank_h), 1)
             nail_y = y + plank_h // 2
-            pygame.draw.circle(surface, (70, 50, 30), (tile_size // 4, nail_y), max(1, plank_h // 6))
-            pygame.draw.circle(
+            dcircle(surface, (70, 50, 30), (tile_size // 4, nail_y), max(1, plank_h // 6))
+            dcircle(
                 surface, (70, 50, 30), (tile_size - tile_size // 4, nail_y), max(1, plank_h // 6)
             )
     else:
         scatter_pixels([tuple(int(c * 0.9) for c in base_color)], tile_size)
 
-    border = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-    pygame.draw.rect(border, (0, 0, 0, 30), border.get_rect(), 1)
-    surface.blit(border, (0, 0))
+    # Darken a 1px border in place; multiplying by 226/256 matches compositing
+    # black at alpha 30 without allocating a second SRCALPHA surface.
+    last = tile_size - 1
+    for edge in ((0, 0, tile_size, 1), (0, last, tile_size, 1), (0, 1, 1, last - 1), (last, 1, 1, last - 1)):
+        surface.fill((226, 226, 226), edge, special_flags=pygame.BLEND_RGB_MULT)
 
-    return surface.convert_alpha()
+    # Every pattern paints opaque pixels, so drop the alpha channel for a
+    # straight copy when tiles are composed into the world surface.
+    return surface.convert()
 
 
 def build_tile_surfaces(tile_types: Dict[str, Dict[str, object]], tile_size: int) -> Dict[str, pygame.Surface]:
@@ -579,6 +712,27 @@ def build_tile_surfaces(tile_types: Dict[str, Dict[str, object]], tile_size: int
     }
 
 
+def build_world_surface(tile_surfaces: Dict[str, pygame.Surface]) -> pygame.Surface:
+    """Compose the whole static map into one Surface so frames need a single blit."""
+
+    world = pygame.Surface((MAP_PIXEL_WIDTH, MAP_PIXEL_HEIGHT))
+    world.fill(OVERWORLD_BACKGROUND)
+    tile_surf_arr: List[Optional[pygame.Surface]] = [tile_surfaces.get("#")] * 256
+    for tile, tile_surface in tile_surfaces.items():
+        tile_surf_arr[ord(tile)] = tile_surface
+    tile_size = TILE_SIZE
+    map_width = MAP_WIDTH
+    world.blits(
+        [
+            (tile_surf_arr[code], ((index % map_width) * tile_size, (index // map_width) * tile_size))
+            for index, code in enumerate(_MAP_FLAT)
+            if tile_surf_arr[code]
+        ],
+        False,
+    )
+    return world.convert()
+
+
 def create_player_sprite(tile_size: int) -> pygame.Surface:
     """Create a simple hero sprite with a distinct silhouette."""
 
@@ -634,6 +788,8 @@ def create_player_sprite(tile_size: int) -> pygame.Surface:
 
 
 class Player:
+    __slots__ = ("tile_x", "tile_y")
+
     def __init__(self, tile_x: int, tile_y: int):
         self.tile_x = tile_x
         self.tile_y = tile_y
@@ -648,6 +804,35 @@ class Player:
 
 
 class BattleState:
+    __slots__ = (
+        "player_party",
+        "trainer_info",
+        "trainer_id",
+        "enemy_party",
+        "enemy_active_index",
+        "enemy_monster",
+        "enemy_display_name",
+        "max_party_size",
+        "active_index",
+        "player_monster",
+        "switch_index",
+        "force_switch",
+        "_player_alive",
+        "_enemy_alive",
+        "menu_state",
+        "action_index",
+        "move_index",
+        "message_queue",
+        "pending_enemy_turn",
+        "after_battle_callback",
+        "ended",
+        "action_options",
+        "captured_monster",
+        "captured_to_storage",
+        "trainer_defeated",
+        "badge_earned",
+    )
+
     def __init__(
         self,
         player_party: List[Monster],
@@ -658,7 +843,9 @@ class BattleState:
     ):
         if not player_party:
             raise ValueError("Player party cannot be empty when a battle begins.")
-        if all(monster.is_fainted() for monster in player_party):
+        # Bit i is set while party member i can still fight.
+        player_alive = self._alive_mask(player_party)
+        if not player_alive:
             raise ValueError("All party monsters have fainted and cannot battle.")
 
         self.player_party = player_party
@@ -667,28 +854,22 @@ class BattleState:
         self.enemy_party = enemy_party or [enemy_monster]
         self.enemy_active_index = 0
         self.enemy_monster = self.enemy_party[self.enemy_active_index]
+        self.enemy_display_name = enemy_label(self, self.enemy_monster)
         self.max_party_size = max_party_size
 
-        preferred_lead = 0
-        if self.player_party[preferred_lead].is_fainted():
-            preferred_lead = next(
-                (
-                    idx
-                    for idx, monster in enumerate(self.player_party)
-                    if not monster.is_fainted()
-                ),
-                0,
-            )
-
-        self.active_index = preferred_lead
+        # Lead with the first monster that can still fight.
+        self.active_index = (player_alive & -player_alive).bit_length() - 1
         self.player_monster = self.player_party[self.active_index]
         self.switch_index = self.active_index
         self.force_switch = False
+        self._player_alive = player_alive
+        self._enemy_alive = self._alive_mask(self.enemy_party)
 
         self.menu_state = "action"  # "action", "move", or "switch"
         self.action_index = 0
         self.move_index = 0
-        self.message_queue: List[Dict[str, Optional[Callable[[], None]]]] = []
+        # (text, callback) pairs shown one at a time in the battle menu box.
+        self.message_queue: Deque[tuple[str, Optional[Callable[[], None]]]] = deque()
         self.pending_enemy_turn = False
         self.after_battle_callback: Optional[Callable[[], None]] = None
         self.ended = False
@@ -705,12 +886,33 @@ class BattleState:
     def party_size(self) -> int:
         return len(self.player_party)
 
+    @staticmethod
+    def _alive_mask(party: List[Monster]) -> int:
+        return sum(1 << idx for idx, monster in enumerate(party) if not monster.is_fainted())
+
+    def on_faint(self, side: str, index: int) -> None:
+        """Clear the alive bit for a monster that just fainted ("player" or "enemy")."""
+        if side == "player":
+            self._player_alive &= ~(1 << index)
+        else:
+            self._enemy_alive &= ~(1 << index)
+
+    def can_switch(self) -> bool:
+        """True if some other party member can still fight."""
+        return bool(self._player_alive & ~(1 << self.active_index))
+
+    def player_wiped_out(self) -> bool:
+        """True once every monster in the player's party has fainted."""
+        return not self._player_alive
+
     def available_switch_targets(self) -> List[int]:
-        return [
-            idx
-            for idx, monster in enumerate(self.player_party)
-            if idx != self.active_index and not monster.is_fainted()
-        ]
+        mask = self._player_alive & ~(1 << self.active_index)
+        targets: List[int] = []
+        while mask:
+            lowest = mask & -mask
+            targets.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return targets
 
     def set_active_monster(self, index: int) -> None:
         self.active_index = index
@@ -720,27 +922,42 @@ class BattleState:
     def set_enemy_monster(self, index: int) -> None:
         self.enemy_active_index = index
         self.enemy_monster = self.enemy_party[index]
+        self.enemy_display_name = enemy_label(self, self.enemy_monster)
 
     def next_enemy_index(self) -> Optional[int]:
-        for idx, monster in enumerate(self.enemy_party):
-            if idx <= self.enemy_active_index:
-                continue
-            if not monster.is_fainted():
-                return idx
-        return None
+        shift = self.enemy_active_index + 1
+        mask = (self._enemy_alive >> shift) << shift
+        if not mask:
+            return None
+        return (mask & -mask).bit_length() - 1
 
     def first_available_switch(self) -> Optional[int]:
-        for idx, monster in enumerate(self.player_party):
-            if idx != self.active_index and not monster.is_fainted():
-                return idx
-        return None
+        mask = self._player_alive & ~(1 << self.active_index)
+        if not mask:
+            return None
+        return (mask & -mask).bit_length() - 1
+
+    def end(self) -> None:
+        self.ended = True
+
+    def end_after_messages(self) -> None:
+        """End the battle once the message queue has been read through."""
+        self.after_battle_callback = self.end
+
+    def finish_capture(self) -> None:
+        enemy = self.enemy_monster
+        self.captured_monster = clone_monster(enemy)
+        self.captured_to_storage = self.party_size >= self.max_party_size
+        if self.captured_to_storage:
+            self.queue_message(f"{enemy.name} will be sent to storage.")
+        self.after_battle_callback = self.end
 
     def queue_message(self, text: str, callback: Optional[Callable[[], None]] = None) -> None:
-        self.message_queue.append({"text": text, "callback": callback})
+        self.message_queue.append((text, callback))
 
-    def pop_message(self) -> Optional[Dict[str, Optional[Callable[[], None]]]]:
+    def pop_message(self) -> Optional[tuple[str, Optional[Callable[[], None]]]]:
         if self.message_queue:
-            return self.message_queue.pop(0)
+            return self.message_queue.popleft()
         return None
 
 
@@ -751,17 +968,13 @@ class BattleState:
 
 def tile_at(x: int, y: int) -> str:
     if 0 <= y < MAP_HEIGHT and 0 <= x < MAP_WIDTH:
-        return MAP_LAYOUT[y][x]
+        return chr(_MAP_FLAT[y * MAP_WIDTH + x])
     return "#"
 
 
-def can_walk(x: int, y: int) -> bool:
-    tile = tile_at(x, y)
-    return TILE_TYPES.get(tile, TILE_TYPES["#"])["walkable"]
-
-
-def on_grass(x: int, y: int) -> bool:
-    return tile_at(x, y) == "G"
+def can_walk(tile: str) -> bool:
+    """True if the hero may step onto a tile with this symbol (see tile_at)."""
+    return tile in _WALKABLE
 
 
 def encounter_chance() -> bool:
@@ -772,25 +985,39 @@ def encounter_chance() -> bool:
 def enemy_label(battle: BattleState, monster: Monster) -> str:
     """Return a readable label for the opposing monster based on battle type."""
 
-    if getattr(battle, "trainer_info", None):
+    if battle.trainer_info:
         trainer_name = battle.trainer_info.get("name", "Trainer")
         return f"{trainer_name}'s {monster.name}"
-    return f"Wild {monster.name}"
+    return _wild_label(monster.name)
+
 
+@lru_cache(maxsize=128)
+def _wild_label(name: str) -> str:
+    return f"Wild {name}"
 
-def calculate_damage(attacker: Monster, defender: Monster, move: Move) -> int:
+
+def resolve_attack(attacker: Monster, defender: Monster, move: Move) -> int:
+    """Roll accuracy and damage for one attack. Returns 0 on a miss.
+
+    This is the only entry point for attack resolution; both turn handlers
+    call it.
+    """
+    if random.random() > move.accuracy:
+        return 0
     base = move.power + attacker.attack - int(defender.defense * 0.5)
-    base = max(base, 1)
-    variance = random.uniform(0.85, 1.0)
-    return max(1, int(base * variance))
+    if base < 1:
+        base = 1
+    damage = int(base * random.uniform(0.85, 1.0))
+    return 1 if damage < 1 else damage
 
 
-def accuracy_check(move: Move) -> bool:
-    return random.random() <= move.accuracy
+@lru_cache(maxsize=128)
+def _exp_for_level(level: int) -> int:
+    return 10 + level * 5
 
 
 def calculate_exp_gain(defeated: Monster) -> int:
-    return 10 + defeated.level * 5
+    return _exp_for_level(defeated.level)
 
 
 def start_battle(
@@ -848,39 +1075,76 @@ def start_trainer_battle(
 # ----------------------------------------------------------------------------
 
 
+# Fixed layout rectangles for the battle menu, party menu and starter screen.
+MENU_RECT = pygame.Rect(20, 360, 600, 100)
+PANEL_RECT = pygame.Rect(50, 50, WINDOW_WIDTH - 100, WINDOW_HEIGHT - 100)
+LIST_RECT = pygame.Rect(PANEL_RECT.x + 20, PANEL_RECT.y + 80, 280, PANEL_RECT.height - 100)
+STARTER_PANEL_RECT = pygame.Rect(60, 60, WINDOW_WIDTH - 120, WINDOW_HEIGHT - 120)
+# HP bar outline size and the red fill area inside its 2px border.
+HP_BAR_WIDTH, HP_BAR_HEIGHT = 200, 20
+HP_BAR_INNER_WIDTH, HP_BAR_INNER_HEIGHT = HP_BAR_WIDTH - 4, HP_BAR_HEIGHT - 4
+# Battle sprite anchors. Loaded sprites are always SPRITE_SIZE square, so their
+# top-left corners are fixed too.
+PLAYER_SPRITE_CENTER = (140, 280)
+ENEMY_SPRITE_CENTER = (500, 200)
+PLAYER_SPRITE_TOPLEFT = (PLAYER_SPRITE_CENTER[0] - SPRITE_SIZE // 2, PLAYER_SPRITE_CENTER[1] - SPRITE_SIZE // 2)
+ENEMY_SPRITE_TOPLEFT = (ENEMY_SPRITE_CENTER[0] - SPRITE_SIZE // 2, ENEMY_SPRITE_CENTER[1] - SPRITE_SIZE // 2)
+# Labels for unused party slots; their Surfaces come from the render_text cache.
+_EMPTY_SLOT_LABELS = tuple(f"  Slot {idx + 1}: --- Empty ---" for idx in range(MAX_PARTY_SIZE))
+# Screen area touched by draw_party_menu: the panel plus the hint line and
+# move list, which can run past the panel's right and bottom edges.
+PARTY_MENU_AREA = pygame.Rect(0, PANEL_RECT.y, WINDOW_WIDTH, WINDOW_HEIGHT - PANEL_RECT.y)
+
+# Visible slice of the world surface; draw_overworld moves it in place.
+_CAMERA_RECT = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+HINT_RECT = pygame.Rect(0, WINDOW_HEIGHT - 32, WINDOW_WIDTH, 32)
+
+
+# Translucent backdrops reused every frame by the overworld hint bar and the
+# party menu. They are flat black with a surface-wide alpha, which blits on
+# SDL's plain alpha path instead of blending per pixel. Built on first use so
+# they can be converted to the display format.
+@lru_cache(maxsize=None)
+def dim_surface(size: tuple[int, int]) -> pygame.Surface:
+    surface = pygame.Surface(size).convert()
+    surface.set_alpha(160)
+    return surface
+
+
+@lru_cache(maxsize=2048)
+def render_text(font: pygame.font.Font, text: str, color: tuple[int, int, int]) -> pygame.Surface:
+    """Render text once per (font, text, color) and reuse the Surface afterwards."""
+    return font.render(text, True, color).convert_alpha()
+
+
 def draw_text(surface: pygame.Surface, text: str, position: tuple[int, int], font: pygame.font.Font, color=(10, 10, 10)) -> None:
-    rendered = font.render(text, True, color)
-    surface.blit(rendered, position)
+    surface.blit(render_text(font, text, color), position)
+
 
 def draw_overworld(
     screen: pygame.Surface,
     player: Player,
     font: pygame.font.Font,
     message: Optional[str],
-    tile_surfaces: Dict[str, pygame.Surface],
+    world_surface: pygame.Surface,
     player_sprite: pygame.Surface,
-) -> None:
-    screen.fill((76, 120, 160))
+) -> tuple[tuple[int, int], pygame.Rect]:
+    """Draw the overworld frame; return the camera's top-left and the hero's screen rect."""
+    if MAP_PIXEL_WIDTH < WINDOW_WIDTH or MAP_PIXEL_HEIGHT < WINDOW_HEIGHT:
+        # The world surface only covers the whole window on large maps.
+        screen.fill(OVERWORLD_BACKGROUND)
 
     player_center_x = player.tile_x * TILE_SIZE + TILE_SIZE // 2
     player_center_y = player.tile_y * TILE_SIZE + TILE_SIZE // 2
 
-    max_cam_x = max(0, MAP_PIXEL_WIDTH - WINDOW_WIDTH)
-    max_cam_y = max(0, MAP_PIXEL_HEIGHT - WINDOW_HEIGHT)
-    cam_x = max(0, min(player_center_x - WINDOW_WIDTH // 2, max_cam_x))
-    cam_y = max(0, min(player_center_y - WINDOW_HEIGHT // 2, max_cam_y))
-
-    for y, row in enumerate(MAP_LAYOUT):
-        for x, tile in enumerate(row):
-            draw_x = x * TILE_SIZE - cam_x
-            draw_y = y * TILE_SIZE - cam_y
-            if draw_x + TILE_SIZE < 0 or draw_y + TILE_SIZE < 0:
-                continue
-            if draw_x >= WINDOW_WIDTH or draw_y >= WINDOW_HEIGHT:
-                continue
-            tile_surface = tile_surfaces.get(tile) or tile_surfaces.get("#")
-            if tile_surface:
-                screen.blit(tile_surface, (draw_x, draw_y))
+    cam_x = max(0, min(player_center_x - WINDOW_WIDTH // 2, MAX_CAMERA_X))
+    cam_y = max(0, min(player_center_y - WINDOW_HEIGHT // 2, MAX_CAMERA_Y))
+
+    camera_rect = _CAMERA_RECT
+    camera_rect.x = cam_x
+    camera_rect.y = cam_y
+    screen.blit(world_surface, (0, 0), camera_rect)
 
     sprite_rect = player_sprite.get_rect()
     sprite_x = (
@@ -893,22 +1157,21 @@ def draw_overworld(
         - cam_y
         + (TILE_SIZE - sprite_rect.height) // 2
     )
-    screen.blit(player_sprite, (sprite_x, sprite_y))
+    sprite_rect.topleft = (sprite_x, sprite_y)
+    screen.blit(player_sprite, sprite_rect)
 
     hint_text = message or "Use arrow keys to explore. Walk on grass to find creatures!"
-    hint_surface = pygame.Surface((WINDOW_WIDTH, 32), pygame.SRCALPHA)
-    hint_surface.fill((0, 0, 0, 160))
-    screen.blit(hint_surface, (0, WINDOW_HEIGHT - 32))
-    draw_text(screen, hint_text, (12, WINDOW_HEIGHT - 26), font, color=(230, 230, 230))
+    screen.blit(dim_surface(HINT_RECT.size), HINT_RECT)
+    draw_text(screen, hint_text, (12, WINDOW_HEIGHT - 26), font, (230, 230, 230))
+    return (cam_x, cam_y), sprite_rect
 
 
 def draw_hp_bar(surface: pygame.Surface, font: pygame.font.Font, monster: Monster, position: tuple[int, int]) -> None:
     x, y = position
-    bar_width = 200
-    bar_height = 20
-    hp_ratio = monster.current_hp / monster.max_hp
-    pygame.draw.rect(surface, (0, 0, 0), (x, y, bar_width, bar_height), 2)
-    pygame.draw.rect(surface, (200, 60, 60), (x + 2, y + 2, int((bar_width - 4) * hp_ratio), bar_height - 4))
+    fill_width = HP_BAR_INNER_WIDTH * monster.current_hp // monster.max_hp
+    pygame.draw.rect(surface, (0, 0, 0), (x, y, HP_BAR_WIDTH, HP_BAR_HEIGHT), 2)
+    if fill_width > 0:
+        pygame.draw.rect(surface, (200, 60, 60), (x + 2, y + 2, fill_width, HP_BAR_INNER_HEIGHT))
     draw_text(surface, f"{monster.name} Lv{monster.level}", (x, y - 22), font)
     draw_text(surface, f"HP: {monster.current_hp}/{monster.max_hp}", (x + 6, y + 2), font)
 
@@ -917,72 +1180,89 @@ def draw_battle(screen: pygame.Surface, battle: BattleState, font: pygame.font.F
     screen.fill((220, 220, 255))
     draw_hp_bar(screen, font, battle.player_monster, (40, 320))
     draw_hp_bar(screen, font, battle.enemy_monster, (360, 120))
-    draw_text(
-        screen,
-        f"EXP: {battle.player_monster.exp}/{battle.player_monster.exp_to_next}",
-        (40, 350),
-        small_font,
-    )
-
-    def blit_or_placeholder(monster: Monster, position: tuple[int, int], fallback_color: tuple[int, int, int]) -> None:
-        sprite = monster.front_sprite
-        if monster is battle.player_monster:
-            sprite = monster.back_sprite or monster.front_sprite
-        if sprite:
-            rect = sprite.get_rect(center=position)
-            screen.blit(sprite, rect)
-        else:
-            pygame.draw.circle(screen, fallback_color, position, 48)
+    player_monster = battle.player_monster
+    draw_text(screen, f"EXP: {player_monster.exp}/{player_monster.exp_to_next}", (40, 350), small_font)
 
-    blit_or_placeholder(battle.player_monster, (140, 280), (255, 120, 80))
-    blit_or_placeholder(battle.enemy_monster, (500, 200), (80, 180, 255))
+    sprite = player_monster.back_sprite or player_monster.front_sprite
+    if sprite:
+        screen.blit(sprite, PLAYER_SPRITE_TOPLEFT)
+    else:
+        pygame.draw.circle(screen, (255, 120, 80), PLAYER_SPRITE_CENTER, 48)
+    sprite = battle.enemy_monster.front_sprite
+    if sprite:
+        screen.blit(sprite, ENEMY_SPRITE_TOPLEFT)
+    else:
+        pygame.draw.circle(screen, (80, 180, 255), ENEMY_SPRITE_CENTER, 48)
 
     # Draw battle menu area
-    menu_rect = pygame.Rect(20, 360, 600, 100)
+    menu_rect = MENU_RECT
     pygame.draw.rect(screen, (245, 245, 245), menu_rect)
     pygame.draw.rect(screen, (0, 0, 0), menu_rect, 2)
 
-    current_message = battle.message_queue[0]["text"] if battle.message_queue else None
+    current_message = battle.message_queue[0][0] if battle.message_queue else None
 
     if current_message:
         draw_text(screen, current_message, (menu_rect.x + 12, menu_rect.y + 12), small_font)
-    elif battle.menu_state == "action":
-        for idx, option in enumerate(battle.action_options):
-            prefix = "> " if idx == battle.action_index else "  "
-            label = option
-            if option == "Catch" and battle.party_size >= battle.max_party_size:
-                label = f"{option} (Send to storage)"
-            if option == "Switch" and not battle.available_switch_targets():
-                label = f"{option} (Unavailable)"
-            draw_text(
-                screen,
-                prefix + label,
-                (menu_rect.x + 12, menu_rect.y + 12 + idx * 24),
-                small_font,
-            )
-    elif battle.menu_state == "move":
-        for idx, move in enumerate(battle.player_monster.moves):
-            prefix = "> " if idx == battle.move_index else "  "
-            text = f"{prefix}{move.name} ({int(move.accuracy * 100)}% accuracy)"
-            draw_text(screen, text, (menu_rect.x + 12, menu_rect.y + 12 + idx * 24), small_font)
-    elif battle.menu_state == "switch":
+    else:
+        draw_menu = _DRAW_MENU.get(battle.menu_state)
+        if draw_menu:
+            draw_menu(screen, battle, small_font, menu_rect)
+
+
+def _draw_action_menu(
+    screen: pygame.Surface, battle: BattleState, small_font: pygame.font.Font, menu_rect: pygame.Rect
+) -> None:
+    for idx, option in enumerate(battle.action_options):
+        prefix = "> " if idx == battle.action_index else "  "
+        label = option
+        if option == "Catch" and battle.party_size >= battle.max_party_size:
+            label = "Catch (Send to storage)"
+        if option == "Switch" and not battle.can_switch():
+            label = "Switch (Unavailable)"
         draw_text(
             screen,
-            "Choose a monster to send out.",
-            (menu_rect.x + 12, menu_rect.y + 12),
+            prefix + label,
+            (menu_rect.x + 12, menu_rect.y + 12 + idx * 24),
             small_font,
         )
-        for idx, monster in enumerate(battle.player_party):
-            prefix = "> " if idx == battle.switch_index else "  "
-            status = "Fainted" if monster.is_fainted() else f"HP {monster.current_hp}/{monster.max_hp}"
-            active_note = " (Active)" if idx == battle.active_index else ""
-            line = f"{prefix}{monster.name} Lv{monster.level} - {status}{active_note}"
-            draw_text(
-                screen,
-                line,
-                (menu_rect.x + 12, menu_rect.y + 36 + idx * 22),
-                small_font,
-            )
+
+
+def _draw_move_menu(
+    screen: pygame.Surface, battle: BattleState, small_font: pygame.font.Font, menu_rect: pygame.Rect
+) -> None:
+    for idx, move in enumerate(battle.player_monster.moves):
+        prefix = "> " if idx == battle.move_index else "  "
+        text = f"{prefix}{move.name} ({int(move.accuracy * 100)}% accuracy)"
+        draw_text(screen, text, (menu_rect.x + 12, menu_rect.y + 12 + idx * 24), small_font)
+
+
+def _draw_switch_menu(
+    screen: pygame.Surface, battle: BattleState, small_font: pygame.font.Font, menu_rect: pygame.Rect
+) -> None:
+    draw_text(
+        screen,
+        "Choose a monster to send out.",
+        (menu_rect.x + 12, menu_rect.y + 12),
+        small_font,
+    )
+    for idx, monster in enumerate(battle.player_party):
+        prefix = "> " if idx == battle.switch_index else "  "
+        status = "Fainted" if monster.is_fainted() else f"HP {monster.current_hp}/{monster.max_hp}"
+        active_note = " (Active)" if idx == battle.active_index else ""
+        line = f"{prefix}{monster.name} Lv{monster.level} - {status}{active_note}"
+        draw_text(
+            screen,
+            line,
+            (menu_rect.x + 12, menu_rect.y + 36 + idx * 22),
+            small_font,
+        )
+
+
+_DRAW_MENU: Dict[str, Callable[[pygame.Surface, BattleState, pygame.font.Font, pygame.Rect], None]] = {
+    "action": _draw_action_menu,
+    "move": _draw_move_menu,
+    "switch": _draw_switch_menu,
+}
 
 
 def draw_party_menu(
@@ -995,12 +1275,13 @@ def draw_party_menu(
     storage_index: int,
     view: str,
     reorder_source: Optional[int],
-) -> None:
-    overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 160))
-    screen.blit(overlay, (0, 0))
+) -> pygame.Rect:
+    """Draw the party/storage panel and return the screen area it covers.
+
+    The dimmed backdrop behind the panel is left to the caller.
+    """
 
-    panel_rect = pygame.Rect(50, 50, WINDOW_WIDTH - 100, WINDOW_HEIGHT - 100)
+    panel_rect = PANEL_RECT
     pygame.draw.rect(screen, (245, 245, 245), panel_rect)
     pygame.draw.rect(screen, (0, 0, 0), panel_rect, 2)
 
@@ -1023,7 +1304,7 @@ def draw_party_menu(
 
     draw_text(screen, hint, (panel_rect.x + 20, panel_rect.y + 46), small_font)
 
-    list_rect = pygame.Rect(panel_rect.x + 20, panel_rect.y + 80, 280, panel_rect.height - 100)
+    list_rect = LIST_RECT
     detail_x = list_rect.right + 30
 
     if view == "party":
@@ -1046,16 +1327,11 @@ def draw_party_menu(
                     font,
                 )
             else:
-                draw_text(
-                    screen,
-                    f"  Slot {idx + 1}: --- Empty ---",
-                    (list_rect.x, list_rect.y + idx * 28),
-                    font,
-                )
+                draw_text(screen, _EMPTY_SLOT_LABELS[idx], (list_rect.x, list_rect.y + idx * 28), font)
 
         if not party:
             draw_text(screen, "Your party is empty!", (detail_x, list_rect.y), font)
-            return
+            return PARTY_MENU_AREA
 
         party_index = max(0, min(party_index, len(party) - 1))
         selected = party[party_index]
@@ -1085,7 +1361,7 @@ def draw_party_menu(
             selected = storage[storage_index]
 
     if not selected:
-        return
+        return PARTY_MENU_AREA
 
     stats_y = list_rect.y
     draw_text(screen, f"Name: {selected.name}", (detail_x, stats_y), font)
@@ -1118,6 +1394,8 @@ def draw_party_menu(
             small_font,
     )
 
+    return PARTY_MENU_AREA
+
 
 def starter_selection_screen(
     screen: pygame.Surface,
@@ -1129,50 +1407,60 @@ def starter_selection_screen(
 ) -> Optional[str]:
     """Show a simple starter selection menu and return the chosen monster name."""
 
+    panel = STARTER_PANEL_RECT
+    labels: List[str] = []
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    background.fill((68, 128, 120))
+    pygame.draw.rect(background, (236, 236, 236), panel)
+    pygame.draw.rect(background, (0, 0, 0), panel, 2)
+    draw_text(background, "Choose your starter companion!", (panel.x + 20, panel.y + 16), font)
+    draw_text(
+        background,
+        "Up/Down to browse · Enter to confirm",
+        (panel.x + 20, panel.y + 44),
+        small_font,
+    )
+    for idx, name in enumerate(starter_names):
+        template = monster_templates.get(name)
+        type_label = template.type if template else "Unknown"
+        labels.append(f"{name} ({type_label})")
+        if template:
+            stats = f"HP {template.max_hp} · ATK {template.attack} · DEF {template.defense} · SPD {template.speed}"
+            draw_text(background, stats, (panel.x + 44, panel.y + 110 + idx * 60), small_font)
+
+    # Only the name lines change with the selection; everything else comes
+    # from the pre-drawn background, so later frames update just this band.
+    names_rect = pygame.Rect(0, panel.y + 84, WINDOW_WIDTH, len(labels) * 60).clip(screen.get_rect())
     selection = 0
+    drawn_selection: Optional[int] = None
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return None
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
+                if event.key == _K_UP:
                     selection = (selection - 1) % len(starter_names)
-                elif event.key == pygame.K_DOWN:
+                elif event.key == _K_DOWN:
                     selection = (selection + 1) % len(starter_names)
-                elif event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_z):
+                elif event.key in _CONFIRM:
                     return starter_names[selection]
+            elif event.type in _EXPOSE_EVENTS:
+                # The window lost its contents; repaint and present it whole.
+                drawn_selection = None
 
-        screen.fill((68, 128, 120))
-        panel = pygame.Rect(60, 60, WINDOW_WIDTH - 120, WINDOW_HEIGHT - 120)
-        pygame.draw.rect(screen, (236, 236, 236), panel)
-        pygame.draw.rect(screen, (0, 0, 0), panel, 2)
-        draw_text(screen, "Choose your starter companion!", (panel.x + 20, panel.y + 16), font)
-        draw_text(
-            screen,
-            "Up/Down to browse · Enter to confirm",
-            (panel.x + 20, panel.y + 44),
-            small_font,
-        )
-
-        for idx, name in enumerate(starter_names):
-            template = monster_templates.get(name)
-            type_label = template.type if template else "Unknown"
-            stats = (
-                f"HP {template.max_hp} · ATK {template.attack} · DEF {template.defense} · SPD {template.speed}"
-                if template
-                else ""
-            )
-            prefix = "> " if idx == selection else "  "
-            draw_text(
-                screen,
-                f"{prefix}{name} ({type_label})",
-                (panel.x + 24, panel.y + 84 + idx * 60),
-                font,
-            )
-            if stats:
-                draw_text(screen, stats, (panel.x + 44, panel.y + 110 + idx * 60), small_font)
-
-        pygame.display.flip()
+        if selection != drawn_selection:
+            if drawn_selection is None:
+                screen.blit(background, (0, 0))
+            else:
+                screen.blit(background, names_rect, names_rect)
+            for idx, label in enumerate(labels):
+                prefix = "> " if idx == selection else "  "
+                draw_text(screen, prefix + label, (panel.x + 24, panel.y + 84 + idx * 60), font)
+            if drawn_selection is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(names_rect)
+            drawn_selection = selection
         clock.tick(60)
 
 
@@ -1181,12 +1469,34 @@ def starter_selection_screen(
 # ----------------------------------------------------------------------------
 
 
+# Key bindings resolved once so the input handlers don't go through the pygame
+# module on every event.
+_K_UP = pygame.K_UP
+_K_DOWN = pygame.K_DOWN
+_K_ESCAPE = pygame.K_ESCAPE
+_CONFIRM = frozenset({pygame.K_RETURN, pygame.K_z, pygame.K_SPACE})
+_VERTICAL = frozenset({_K_UP, _K_DOWN})
+# Window events after which the whole window has to be presented again.
+_EXPOSE_EVENTS = frozenset(
+    {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN}
+)
+# Events after which the main loop has to draw a new frame.
+_REDRAW_EVENTS = _EXPOSE_EVENTS | {pygame.KEYDOWN}
+_ARROW_DELTAS = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+}
+
+
 def handle_battle_input(event: pygame.event.Event, battle: BattleState) -> None:
     if battle.message_queue:
-        if event.type == pygame.KEYDOWN and event.key in (pygame.K_SPACE, pygame.K_RETURN, pygame.K_z):
+        if event.type == pygame.KEYDOWN and event.key in _CONFIRM:
             message = battle.pop_message()
-            if message and message["callback"]:
-                message["callback"]()
+            callback = message[1] if message else None
+            if callback:
+                callback()
             # After message callbacks run, check whether enemy turn should start
             if not battle.message_queue and battle.pending_enemy_turn:
                 battle.pending_enemy_turn = False
@@ -1201,10 +1511,10 @@ def handle_battle_input(event: pygame.event.Event, battle: BattleState) -> None:
         return
 
     if battle.force_switch:
-        if not battle.available_switch_targets():
+        if not battle.can_switch():
             battle.force_switch = False
             battle.queue_message("All of your monsters have fainted!")
-            battle.after_battle_callback = lambda: setattr(battle, "ended", True)
+            battle.end_after_messages()
             return
         if battle.menu_state != "switch":
             first_option = battle.first_available_switch()
@@ -1212,60 +1522,76 @@ def handle_battle_input(event: pygame.event.Event, battle: BattleState) -> None:
                 battle.switch_index = first_option
             battle.menu_state = "switch"
 
-    if battle.menu_state == "action":
-        if event.key in (pygame.K_UP, pygame.K_DOWN):
-            option_count = len(battle.action_options)
-            battle.action_index = (
-                battle.action_index + (1 if event.key == pygame.K_DOWN else -1)
-            ) % option_count
-        elif event.key in (pygame.K_RETURN, pygame.K_z, pygame.K_SPACE):
-            selected_option = battle.action_options[battle.action_index]
-            if selected_option == "Fight":
-                battle.menu_state = "move"
-                battle.move_index = 0
-            elif selected_option == "Switch":
-                targets = battle.available_switch_targets()
-                if not targets:
-                    battle.queue_message("No other monsters can fight!")
-                else:
-                    if battle.switch_index not in targets:
-                        battle.switch_index = targets[0]
-                    battle.menu_state = "switch"
-            elif selected_option == "Catch":
-                attempt_capture(battle)
+    handler = _BATTLE_INPUT.get(battle.menu_state)
+    if handler:
+        handler(event, battle)
+
+
+def _handle_action_input(event: pygame.event.Event, battle: BattleState) -> None:
+    if event.key in _VERTICAL:
+        option_count = len(battle.action_options)
+        battle.action_index = (
+            battle.action_index + (1 if event.key == _K_DOWN else -1)
+        ) % option_count
+    elif event.key in _CONFIRM:
+        selected_option = battle.action_options[battle.action_index]
+        if selected_option == "Fight":
+            battle.menu_state = "move"
+            battle.move_index = 0
+        elif selected_option == "Switch":
+            targets = battle.available_switch_targets()
+            if not targets:
+                battle.queue_message("No other monsters can fight!")
             else:
-                attempt_escape(battle)
-    elif battle.menu_state == "move":
-        moves_len = len(battle.player_monster.moves)
-        if event.key == pygame.K_UP:
-            battle.move_index = (battle.move_index - 1) % moves_len
-        elif event.key == pygame.K_DOWN:
-            battle.move_index = (battle.move_index + 1) % moves_len
-        elif event.key == pygame.K_ESCAPE:
+                if battle.switch_index not in targets:
+                    battle.switch_index = targets[0]
+                battle.menu_state = "switch"
+        elif selected_option == "Catch":
+            attempt_capture(battle)
+        else:
+            attempt_escape(battle)
+
+
+def _handle_move_input(event: pygame.event.Event, battle: BattleState) -> None:
+    moves_len = len(battle.player_monster.moves)
+    if event.key == _K_UP:
+        battle.move_index = (battle.move_index - 1) % moves_len
+    elif event.key == _K_DOWN:
+        battle.move_index = (battle.move_index + 1) % moves_len
+    elif event.key == _K_ESCAPE:
+        battle.menu_state = "action"
+    elif event.key in _CONFIRM:
+        selected_move = battle.player_monster.moves[battle.move_index]
+        execute_player_turn(battle, selected_move)
+
+
+def _handle_switch_input(event: pygame.event.Event, battle: BattleState) -> None:
+    party_len = battle.party_size
+    if party_len == 0:
+        return
+    if event.key == _K_UP:
+        battle.switch_index = (battle.switch_index - 1) % party_len
+    elif event.key == _K_DOWN:
+        battle.switch_index = (battle.switch_index + 1) % party_len
+    elif event.key == _K_ESCAPE:
+        if not battle.force_switch:
             battle.menu_state = "action"
-        elif event.key in (pygame.K_RETURN, pygame.K_z, pygame.K_SPACE):
-            selected_move = battle.player_monster.moves[battle.move_index]
-            execute_player_turn(battle, selected_move)
-    elif battle.menu_state == "switch":
-        party_len = battle.party_size
-        if party_len == 0:
+    elif event.key in _CONFIRM:
+        if battle.switch_index == battle.active_index:
+            battle.queue_message("That monster is already in battle!")
             return
-        if event.key == pygame.K_UP:
-            battle.switch_index = (battle.switch_index - 1) % party_len
-        elif event.key == pygame.K_DOWN:
-            battle.switch_index = (battle.switch_index + 1) % party_len
-        elif event.key == pygame.K_ESCAPE:
-            if not battle.force_switch:
-                battle.menu_state = "action"
-        elif event.key in (pygame.K_RETURN, pygame.K_z, pygame.K_SPACE):
-            if battle.switch_index == battle.active_index:
-                battle.queue_message("That monster is already in battle!")
-                return
-            chosen = battle.player_party[battle.switch_index]
-            if chosen.is_fainted():
-                battle.queue_message(f"{chosen.name} can't fight!")
-                return
-            perform_player_switch(battle, battle.switch_index, costs_turn=not battle.force_switch)
+        chosen = battle.player_party[battle.switch_index]
+        if chosen.is_fainted():
+            battle.queue_message(f"{chosen.name} can't fight!")
+            return
+        perform_player_switch(battle, battle.switch_index, costs_turn=not battle.force_switch)
+
+
+_BATTLE_INPUT: Dict[str, Callable[[pygame.event.Event, BattleState], None]] = {
+    "action": _handle_action_input,
+    "move": _handle_move_input,
+    "switch": _handle_switch_input,
+}
 
 
 def perform_player_switch(battle: BattleState, new_index: int, costs_turn: bool) -> None:
@@ -1282,20 +1608,21 @@ def execute_player_turn(battle: BattleState, move: Move) -> None:
     attacker = battle.player_monster
     defender = battle.enemy_monster
 
-    if not accuracy_check(move):
+    damage = resolve_attack(attacker, defender, move)
+    if not damage:
         battle.queue_message(f"{attacker.name}'s {move.name} missed!")
     else:
-        damage = calculate_damage(attacker, defender, move)
         defender.current_hp = max(0, defender.current_hp - damage)
         battle.queue_message(f"{attacker.name} used {move.name}!")
         battle.queue_message(f"It dealt {damage} damage!")
 
         if defender.is_fainted():
+            battle.on_faint("enemy", battle.enemy_active_index)
             exp_gain = calculate_exp_gain(defender)
 
             def handle_trainer_follow_up() -> None:
                 if not battle.trainer_info:
-                    battle.after_battle_callback = lambda: setattr(battle, "ended", True)
+                    battle.end_after_messages()
                     return
 
                 trainer_name = battle.trainer_info.get("name", "Trainer")
@@ -1304,17 +1631,13 @@ def execute_player_turn(battle: BattleState, move: Move) -> None:
                     battle.trainer_defeated = True
                     if battle.trainer_info.get("is_gym_leader") and battle.trainer_info.get("badge_name"):
                         battle.badge_earned = str(battle.trainer_info.get("badge_name"))
-
-                    def finish_battle() -> None:
-                        battle.after_battle_callback = lambda: setattr(battle, "ended", True)
-
                     after_dialogue = battle.trainer_info.get("dialogue_after", [])
                     if after_dialogue:
                         for idx, line in enumerate(after_dialogue):
-                            callback = finish_battle if idx == len(after_dialogue) - 1 else None
+                            callback = battle.end_after_messages if idx == len(after_dialogue) - 1 else None
                             battle.queue_message(f"{trainer_name}: {line}", callback=callback)
                     else:
-                        finish_battle()
+                        battle.end_after_messages()
                 else:
                     battle.set_enemy_monster(next_index)
                     battle.queue_message(f"{trainer_name} sent out {battle.enemy_monster.name}!")
@@ -1325,7 +1648,7 @@ def execute_player_turn(battle: BattleState, move: Move) -> None:
                     battle.queue_message(message)
                 handle_trainer_follow_up()
 
-            battle.queue_message(f"{enemy_label(battle, defender)} fainted!")
+            battle.queue_message(f"{battle.enemy_display_name} fainted!")
             battle.queue_message(f"{attacker.name} gained {exp_gain} EXP!", callback=award_exp)
             battle.pending_enemy_turn = False
             battle.menu_state = "action"
@@ -1342,14 +1665,16 @@ def execute_enemy_turn(battle: BattleState) -> None:
     defender = battle.player_monster
     move = random.choice(attacker.moves)
 
-    if not accuracy_check(move):
-        battle.queue_message(f"{enemy_label(battle, attacker)}'s {move.name} missed!")
+    damage = resolve_attack(attacker, defender, move)
+    if not damage:
+        battle.queue_message(f"{battle.enemy_display_name}'s {move.name} missed!")
     else:
-        damage = calculate_damage(attacker, defender, move)
         defender.current_hp = max(0, defender.current_hp - damage)
-        battle.queue_message(f"{enemy_label(battle, attacker)} used {move.name}!")
+        battle.queue_message(f"{battle.enemy_display_name} used {move.name}!")
         battle.queue_message(f"It dealt {damage} damage!")
         if defender.is_fainted():
+            battle.on_faint("player", battle.active_index)
+
             def handle_faint() -> None:
                 next_option = battle.first_available_switch()
                 if next_option is not None:
@@ -1357,7 +1682,7 @@ def execute_enemy_turn(battle: BattleState) -> None:
                     battle.menu_state = "switch"
                     battle.switch_index = next_option
                 else:
-                    battle.after_battle_callback = lambda: setattr(battle, "ended", True)
+                    battle.end_after_messages()
 
             battle.queue_message(f"{defender.name} fainted!", callback=handle_faint)
 
@@ -1376,15 +1701,7 @@ def attempt_capture(battle: BattleState) -> None:
     hp_ratio = enemy.current_hp / enemy.max_hp if enemy.max_hp else 1.0
     catch_chance = 0.3 + (1.0 - hp_ratio) * 0.5
     if random.random() <= catch_chance:
-
-        def finish_capture() -> None:
-            battle.captured_monster = clone_monster(enemy)
-            battle.captured_to_storage = battle.party_size >= battle.max_party_size
-            if battle.captured_to_storage:
-                battle.queue_message(f"{enemy.name} will be sent to storage.")
-            battle.after_battle_callback = lambda: setattr(battle, "ended", True)
-
-        battle.queue_message(f"You caught {enemy.name}!", callback=finish_capture)
+        battle.queue_message(f"You caught {enemy.name}!", callback=battle.finish_capture)
         battle.pending_enemy_turn = False
     else:
         battle.queue_message(f"{enemy.name} broke free!")
@@ -1400,25 +1717,189 @@ def attempt_escape(battle: BattleState) -> None:
         battle.pending_enemy_turn = True
         return
     if random.random() < 0.5:
-        battle.queue_message("Got away safely!", callback=lambda: setattr(battle, "ended", True))
+        battle.queue_message("Got away safely!", callback=battle.end)
     else:
         battle.queue_message("Couldn't escape!")
         battle.pending_enemy_turn = True
 
 
+def apply_battle_outcome(
+    battle: BattleState,
+    party: List[Monster],
+    storage: List[Monster],
+    badges: Set[str],
+    defeated_trainers: Set[str],
+) -> Optional[tuple[str, float]]:
+    """Fold a finished battle into the player's progress.
+
+    Returns the overworld notice to show and how many seconds to show it for.
+    """
+
+    notice: Optional[tuple[str, float]] = None
+    if battle.player_wiped_out():
+        for monster in party:
+            monster.heal()
+        notice = ("Your party was revived after the battle!", 4.0)
+
+    if battle.captured_monster:
+        captured = battle.captured_monster
+        if battle.captured_to_storage:
+            storage.append(captured)
+            notice = (f"{captured.name} was sent to storage!", 4.0)
+        elif len(party) < MAX_PARTY_SIZE:
+            party.append(captured)
+            notice = (f"{captured.name} joined your party!", 4.0)
+        else:
+            storage.append(captured)
+            notice = (f"{captured.name} was sent to storage!", 4.0)
+
+    if battle.trainer_defeated and battle.trainer_id:
+        defeated_trainers.add(battle.trainer_id)
+        trainer_name = None
+        if battle.trainer_info:
+            trainer_name = battle.trainer_info.get("name")
+        if battle.badge_earned:
+            badges.add(battle.badge_earned)
+            notice = (f"You received the {battle.badge_earned}!", 4.0)
+        elif trainer_name:
+            notice = (f"{trainer_name} was defeated!", 3.0)
+    return notice
+
+
+# ----------------------------------------------------------------------------
+# Party menu
+# ----------------------------------------------------------------------------
+
+
+class PartyMenuState:
+    """Cursor and selection state for the party/storage menu."""
+
+    def __init__(self, party: List[Monster], storage: List[Monster]):
+        self.party = party
+        self.storage = storage
+        self.view = "party"  # "party" or "storage"
+        self.party_index = 0
+        self.storage_index = 0
+        self.reorder_source: Optional[int] = None
+        # Set by the handlers and consumed by the main loop.
+        self.message: Optional[str] = None
+        self.closed = False
+
+    def open(self) -> None:
+        self.party_index = max(0, min(self.party_index, len(self.party) - 1))
+        self.view = "party"
+        self.reorder_source = None
+        self.closed = False
+
+
+def _party_menu_close(menu: PartyMenuState) -> None:
+    if menu.reorder_source is not None:
+        menu.reorder_source = None
+    else:
+        menu.closed = True
+
+
+def _party_menu_toggle_view(menu: PartyMenuState) -> None:
+    menu.reorder_source = None
+    menu.view = "storage" if menu.view == "party" else "party"
+
+
+def _party_menu_move(menu: PartyMenuState, step: int) -> None:
+    if menu.view == "party":
+        count = len(menu.party)
+        if count:
+            menu.party_index = (menu.party_index + step) % count
+    else:
+        count = len(menu.storage)
+        if count:
+            menu.storage_index = (menu.storage_index + step) % count
+
+
+def _party_menu_deposit(menu: PartyMenuState) -> None:
+    party = menu.party
+    if menu.view != "party" or not party:
+        return
+    remaining = len(party) - 1
+    if remaining < 1:
+        menu.message = "You need at least one monster in your party."
+        return
+    monster = party.pop(menu.party_index)
+    menu.storage.append(monster)
+    menu.party_index = min(menu.party_index, remaining - 1)
+    menu.reorder_source = None
+    menu.message = f"{monster.name} was sent to storage."
+
+
+def _party_menu_withdraw(menu: PartyMenuState) -> None:
+    storage = menu.storage
+    if menu.view != "storage" or not storage:
+        return
+    if len(menu.party) >= MAX_PARTY_SIZE:
+        menu.message = "Party is full. Release a slot first."
+        return
+    monster = storage.pop(menu.storage_index)
+    menu.party.append(monster)
+    menu.storage_index = max(0, min(menu.storage_index, len(storage) - 1))
+    menu.message = f"{monster.name} joined your party."
+
+
+def _party_menu_select(menu: PartyMenuState) -> None:
+    party = menu.party
+    if menu.view != "party" or not party:
+        return
+    source = menu.reorder_source
+    if source is None:
+        menu.reorder_source = menu.party_index
+        return
+    target = menu.party_index
+    if target != source:
+        party[source], party[target] = party[target], party[source]
+    menu.reorder_source = None
+
+
+def _party_menu_cancel(menu: PartyMenuState) -> None:
+    menu.reorder_source = None
+
+
+_PARTY_MENU_INPUT: Dict[int, Callable[[PartyMenuState], None]] = {
+    pygame.K_ESCAPE: _party_menu_close,
+    pygame.K_p: _party_menu_close,
+    pygame.K_TAB: _party_menu_close,
+    pygame.K_LEFT: _party_menu_toggle_view,
+    pygame.K_RIGHT: _party_menu_toggle_view,
+    pygame.K_UP: lambda menu: _party_menu_move(menu, -1),
+    pygame.K_DOWN: lambda menu: _party_menu_move(menu, 1),
+    pygame.K_d: _party_menu_deposit,
+    pygame.K_w: _party_menu_withdraw,
+    pygame.K_RETURN: _party_menu_select,
+    pygame.K_SPACE: _party_menu_select,
+    pygame.K_BACKSPACE: _party_menu_cancel,
+}
+
+
 # ----------------------------------------------------------------------------
 # Main game loop
 # ----------------------------------------------------------------------------
 
 
+class GameMode(IntEnum):
+    OVERWORLD = 0
+    BATTLE = 1
+    PARTY_MENU = 2
+
+
 def main() -> None:
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Mythic Bond Prototype")
+    # Keep mouse motion and other unused events out of the queue entirely.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, SAVE_FINISHED, *_REDRAW_EVENTS])
     clock = pygame.time.Clock()
     font = pygame.font.Font(None, 24)
     small_font = pygame.font.Font(None, 20)
     tile_surfaces = build_tile_surfaces(TILE_TYPES, TILE_SIZE)
+    world_surface = build_world_surface(tile_surfaces)
     player_sprite = create_player_sprite(TILE_SIZE)
 
     move_library, monster_templates = load_monster_definitions()
@@ -1438,11 +1919,9 @@ def main() -> None:
         default_party = [clone_monster(monster) for monster in template_list[:3]]
     if not default_party:
         raise ValueError("No monsters defined in monsters.json. Add at least one monster entry.")
-    player_position, player_party, player_storage, badges, defeated_trainers = load_game_state(
+    player_position, player_party, player_storage, earned_badges, defeated_trainers_set = load_game_state(
         SAVE_FILE, monster_templates, default_party, DEFAULT_START_POSITION
     )
-    earned_badges: Set[str] = set(badges)
-    defeated_trainers_set: Set[str] = set(defeated_trainers)
     player_party = player_party[:MAX_PARTY_SIZE]
     player_storage = list(player_storage)
     if not player_party:
@@ -1450,105 +1929,86 @@ def main() -> None:
     wild_pool = template_list
 
     player = Player(tile_x=player_position[0], tile_y=player_position[1])
-    game_mode = "overworld"
+    game_mode = GameMode.OVERWORLD
     active_battle: Optional[BattleState] = None
     overworld_message: Optional[str] = None
-    overworld_message_timer = 0
-    party_selection = 0
-    storage_selection = 0
-    party_menu_view = "party"
-    party_reorder_source: Optional[int] = None
-
-    def end_battle() -> None:
-        nonlocal game_mode, active_battle, overworld_message, overworld_message_timer, player_storage, earned_badges, defeated_trainers_set
-        if not active_battle:
-            return
-        if all(monster.is_fainted() for monster in player_party):
-            for monster in player_party:
-                monster.heal()
-            overworld_message = "Your party was revived after the battle!"
-            overworld_message_timer = 240
-
-        if active_battle.captured_monster:
-            captured = active_battle.captured_monster
-            if active_battle.captured_to_storage:
-                player_storage.append(captured)
-                overworld_message = f"{captured.name} was sent to storage!"
-            elif len(player_party) < MAX_PARTY_SIZE:
-                player_party.append(captured)
-                overworld_message = f"{captured.name} joined your party!"
-            else:
-                player_storage.append(captured)
-                overworld_message = f"{captured.name} was sent to storage!"
-            overworld_message_timer = 240
-
-        if active_battle.trainer_defeated and active_battle.trainer_id:
-            defeated_trainers_set.add(active_battle.trainer_id)
-            trainer_name = None
-            if active_battle.trainer_info:
-                trainer_name = active_battle.trainer_info.get("name")
-            if active_battle.badge_earned:
-                earned_badges.add(active_battle.badge_earned)
-                overworld_message = f"You received the {active_battle.badge_earned}!"
-                overworld_message_timer = 240
-            elif trainer_name:
-                overworld_message = f"{trainer_name} was defeated!"
-                overworld_message_timer = 180
-        game_mode = "overworld"
-        active_battle = None
-
+    overworld_message_deadline = 0.0
+    party_menu = PartyMenuState(player_party, player_storage)
+
+    needs_redraw = True
+    # Dimmed overworld behind the party menu, keyed by the state it was drawn from.
+    party_backdrop: Optional[tuple[tuple[int, int, Optional[str]], pygame.Surface]] = None
+    # Camera offset and hero rect of the overworld frame currently on the
+    # display, if any.
+    overworld_view: Optional[tuple[tuple[int, int], pygame.Rect]] = None
     running = True
     while running:
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if not events and not needs_redraw:
+            # Nothing is pending, so sleep in SDL until the next input (or
+            # until the overworld message is due to disappear) instead of
+            # waking up 60 times a second.
+            if overworld_message:
+                timeout = int((overworld_message_deadline - time.monotonic()) * 1000)
+                if timeout > 0:
+                    events = [pygame.event.wait(timeout)]
+            else:
+                events = [pygame.event.wait()]
+        # At most one overworld step per batch, however many arrow presses
+        # piled up in the queue. Presses into walls don't count.
+        stepped = False
+        for event in events:
+            # Only key presses change game state; expose/restore events mean
+            # the window contents need repainting.
+            if event.type in _REDRAW_EVENTS:
+                needs_redraw = True
+                if event.type in _EXPOSE_EVENTS:
+                    # Forget what is on the display so this frame is pushed
+                    # in full rather than as a partial update.
+                    overworld_view = None
+                    party_backdrop = None
             if event.type == pygame.QUIT:
                 running = False
-            elif game_mode == "overworld" and event.type == pygame.KEYDOWN:
+            elif event.type == SAVE_FINISHED:
+                # Report the write only once it has actually reached the disk.
+                overworld_message = finish_save(event.future)
+                overworld_message_deadline = time.monotonic() + 3.0
+                needs_redraw = True
+            elif game_mode == GameMode.OVERWORLD and event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_s:
                     save_game_state(
                         SAVE_FILE,
                         player,
                         player_party,
                         player_storage,
-                        list(earned_badges),
-                        list(defeated_trainers_set),
+                        earned_badges,
+                        defeated_trainers_set,
                     )
-                    overworld_message = "Game saved!"
-                    overworld_message_timer = 180
+                    overworld_message = "Saving..."
+                    overworld_message_deadline = time.monotonic() + 3.0
                     continue
 
                 if event.key in (pygame.K_p, pygame.K_TAB):
-                    if player_party:
-                        party_selection = max(0, min(party_selection, len(player_party) - 1))
-                    else:
-                        party_selection = 0
-                    game_mode = "party_menu"
-                    party_menu_view = "party"
-                    party_reorder_source = None
+                    party_menu.open()
+                    game_mode = GameMode.PARTY_MENU
                     continue
 
-                dx, dy = 0, 0
-                if event.key == pygame.K_UP:
-                    dy = -1
-                elif event.key == pygame.K_DOWN:
-                    dy = 1
-                elif event.key == pygame.K_LEFT:
-                    dx = -1
-                elif event.key == pygame.K_RIGHT:
-                    dx = 1
-
-                if dx or dy:
+                dx, dy = _ARROW_DELTAS.get(event.key, (0, 0))
+                if (dx or dy) and not stepped:
                     new_x = player.tile_x + dx
                     new_y = player.tile_y + dy
-                    if can_walk(new_x, new_y):
+                    # One map lookup serves collision, healing and encounters.
+                    tile_symbol = tile_at(new_x, new_y)
+                    if can_walk(tile_symbol):
+                        stepped = True
                         player.tile_x = new_x
                         player.tile_y = new_y
-                        tile_symbol = tile_at(new_x, new_y)
                         if tile_symbol == "H":
                             for monster in player_party:
                                 monster.heal()
                             overworld_message = "Your party was restored at the roadside house!"
-                            overworld_message_timer = 180
-                        trainer_id = TRAINER_TILES.get(tile_symbol)
+                            overworld_message_deadline = time.monotonic() + 3.0
+                        trainer_id = _TRAINER_POSITIONS.get((new_x, new_y))
                         if (
                             trainer_id
                             and trainer_id in trainers
@@ -1558,15 +2018,15 @@ def main() -> None:
                                 trainer_id, trainers, monster_templates, player_party, MAX_PARTY_SIZE
                             )
                             if battle:
-                                game_mode = "battle"
+                                game_mode = GameMode.BATTLE
                                 active_battle = battle
                                 overworld_message = None
                                 continue
                             else:
                                 overworld_message = "Trainer data missing."
-                                overworld_message_timer = 180
+                                overworld_message_deadline = time.monotonic() + 3.0
                         if tile_symbol == "G" and encounter_chance():
-                            game_mode = "battle"
+                            game_mode = GameMode.BATTLE
                             active_battle = start_battle(
                                 player_party,
                                 wild_pool,
@@ -1574,109 +2034,102 @@ def main() -> None:
                             )
                             overworld_message = None
 
-            elif game_mode == "battle" and active_battle:
+            elif game_mode == GameMode.BATTLE and active_battle:
                 handle_battle_input(event, active_battle)
-            elif game_mode == "party_menu" and event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_ESCAPE, pygame.K_p, pygame.K_TAB):
-                    if party_reorder_source is not None:
-                        party_reorder_source = None
-                    else:
-                        game_mode = "overworld"
-                elif event.key == pygame.K_s:
+            elif game_mode == GameMode.PARTY_MENU and event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_s:
                     save_game_state(
                         SAVE_FILE,
                         player,
                         player_party,
                         player_storage,
-                        list(earned_badges),
-                        list(defeated_trainers_set),
+                        earned_badges,
+                        defeated_trainers_set,
                     )
-                    overworld_message = "Game saved!"
-                    overworld_message_timer = 180
-                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
-                    party_reorder_source = None
-                    party_menu_view = "storage" if party_menu_view == "party" else "party"
-                elif event.key == pygame.K_UP:
-                    if party_menu_view == "party" and player_party:
-                        party_selection = (party_selection - 1) % len(player_party)
-                    elif party_menu_view == "storage" and player_storage:
-                        storage_selection = (storage_selection - 1) % len(player_storage)
-                elif event.key == pygame.K_DOWN:
-                    if party_menu_view == "party" and player_party:
-                        party_selection = (party_selection + 1) % len(player_party)
-                    elif party_menu_view == "storage" and player_storage:
-                        storage_selection = (storage_selection + 1) % len(player_storage)
-                elif event.key == pygame.K_d and party_menu_view == "party" and player_party:
-                    if len(player_party) <= 1:
-                        overworld_message = "You need at least one monster in your party."
-                        overworld_message_timer = 180
-                    else:
-                        monster = player_party.pop(party_selection)
-                        player_storage.append(monster)
-                        party_selection = max(0, min(party_selection, len(player_party) - 1))
-                        party_reorder_source = None
-                        overworld_message = f"{monster.name} was sent to storage."
-                        overworld_message_timer = 180
-                elif event.key == pygame.K_w and party_menu_view == "storage" and player_storage:
-                    if len(player_party) >= MAX_PARTY_SIZE:
-                        overworld_message = "Party is full. Release a slot first."
-                        overworld_message_timer = 180
-                    else:
-                        monster = player_storage.pop(storage_selection)
-                        player_party.append(monster)
-                        if player_storage:
-                            storage_selection = max(0, min(storage_selection, len(player_storage) - 1))
-                        else:
-                            storage_selection = 0
-                        overworld_message = f"{monster.name} joined your party."
-                        overworld_message_timer = 180
-                elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                    if party_menu_view == "party" and player_party:
-                        if party_reorder_source is None:
-                            party_reorder_source = party_selection
-                        else:
-                            if party_selection != party_reorder_source:
-                                player_party[party_reorder_source], player_party[party_selection] = (
-                                    player_party[party_selection],
-                                    player_party[party_reorder_source],
-                                )
-                            party_reorder_source = None
-                elif event.key == pygame.K_BACKSPACE:
-                    if party_reorder_source is not None:
-                        party_reorder_source = None
-
-        screen.fill((0, 0, 0))
-
-        if game_mode == "overworld":
-            draw_overworld(screen, player, font, overworld_message, tile_surfaces, player_sprite)
-        elif game_mode == "battle" and active_battle:
-            draw_battle(screen, active_battle, font, small_font)
-            if getattr(active_battle, "ended", False) and not active_battle.message_queue and not active_battle.pending_enemy_turn:
-                end_battle()
-        elif game_mode == "party_menu":
-            draw_overworld(screen, player, font, overworld_message, tile_surfaces, player_sprite)
-            draw_party_menu(
-                screen,
-                player_party,
-                player_storage,
-                font,
-                small_font,
-                party_selection,
-                storage_selection,
-                party_menu_view,
-                party_reorder_source,
-            )
+                    overworld_message = "Saving..."
+                    overworld_message_deadline = time.monotonic() + 3.0
+                    continue
 
-        if overworld_message_timer > 0:
-            overworld_message_timer -= 1
-            if overworld_message_timer == 0:
-                overworld_message = None
+                handler = _PARTY_MENU_INPUT.get(event.key)
+                if handler:
+                    handler(party_menu)
+                if party_menu.message:
+                    overworld_message = party_menu.message
+                    overworld_message_deadline = time.monotonic() + 3.0
+                    party_menu.message = None
+                if party_menu.closed:
+                    game_mode = GameMode.OVERWORLD
+
+        if needs_redraw:
+            needs_redraw = False
+            shown_view = None
+            if game_mode == GameMode.PARTY_MENU:
+                # The dimmed overworld behind the menu only changes with the
+                # player's position or message; otherwise restore it under the
+                # panel and push just that area to the display.
+                backdrop_key = (player.tile_x, player.tile_y, overworld_message)
+                full_frame = party_backdrop is None or party_backdrop[0] != backdrop_key
+                if full_frame:
+                    draw_overworld(screen, player, font, overworld_message, world_surface, player_sprite)
+                    screen.blit(dim_surface((WINDOW_WIDTH, WINDOW_HEIGHT)), (0, 0))
+                    party_backdrop = (backdrop_key, screen.copy())
+                else:
+                    screen.blit(party_backdrop[1], PARTY_MENU_AREA, PARTY_MENU_AREA)
+                dirty_rect = draw_party_menu(
+                    screen,
+                    player_party,
+                    player_storage,
+                    font,
+                    small_font,
+                    party_menu.party_index,
+                    party_menu.storage_index,
+                    party_menu.view,
+                    party_menu.reorder_source,
+                )
+                if full_frame:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rect)
+            else:
+                party_backdrop = None
+                # draw_overworld and draw_battle both paint every pixel, so
+                # there is no separate clear.
+                if game_mode == GameMode.OVERWORLD:
+                    shown_view = draw_overworld(
+                        screen, player, font, overworld_message, world_surface, player_sprite
+                    )
+                    sprite_rect = shown_view[1]
+                    if overworld_view is not None and overworld_view[0] == shown_view[0]:
+                        # The camera didn't move (or is clamped at the map
+                        # edge), so only the hero's old and new spots and the
+                        # hint line can have changed.
+                        pygame.display.update([overworld_view[1], sprite_rect, HINT_RECT])
+                    else:
+                        pygame.display.flip()
+                elif game_mode == GameMode.BATTLE and active_battle:
+                    draw_battle(screen, active_battle, font, small_font)
+                    if active_battle.ended and not active_battle.message_queue and not active_battle.pending_enemy_turn:
+                        notice = apply_battle_outcome(
+                            active_battle, player_party, player_storage, earned_badges, defeated_trainers_set
+                        )
+                        if notice:
+                            overworld_message = notice[0]
+                            overworld_message_deadline = time.monotonic() + notice[1]
+                        game_mode = GameMode.OVERWORLD
+                        active_battle = None
+                        needs_redraw = True
+                    pygame.display.flip()
+            overworld_view = shown_view
+
+        if overworld_message and time.monotonic() >= overworld_message_deadline:
+            overworld_message = None
+            needs_redraw = True
 
-        pygame.display.flip()
         clock.tick(60)
 
+    errors = wait_for_pending_save()
     pygame.quit()
-    sys.exit()
+    sys.exit("\n".join(f"Save failed: {error}" for error in errors) or None)
 
 
 if __name__ == "__main__":